@@ -17,30 +17,107 @@ PASS criteria:
 import argparse
 import json
 import sys
-from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
-from collections import Counter
+from typing import Dict, List, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import hashlib
-
-
-def compute_file_hash(file_path: Path) -> str:
-    """Compute SHA-256 hash of a file."""
-    sha256 = hashlib.sha256()
+import hmac
+import numpy as np
+import orjson
+
+# SAR vocabulary, schema validation and the validation marker are shared with
+# generate_sar.py so the two cannot drift
+from generate_sar import (
+    CONFIDENCE_LEVELS,
+    DECISION_GATES,
+    FAILURE_CLASSES,
+    SAR_SCHEMA_SHA256,
+    VALIDATION_MARKER,
+    schema_errors,
+    utc_timestamp,
+)
+
+# Read size for the fallback hashing loop; large enough that update() releases the GIL
+HASH_CHUNK_SIZE = 1 << 20
+
+# Initialized SHA-256 state, copied per file instead of constructing a new hasher
+_SHA256_PROTO = hashlib.sha256()
+
+# Integer codes for decision gates, failure classes and confidence bins (the
+# tuples come from generate_sar.py; confidence bins are also the report order)
+_GATE_INDEX = {gate: i for i, gate in enumerate(DECISION_GATES)}
+_FAILURE_CLASS_INDEX = {cls: i for i, cls in enumerate(FAILURE_CLASSES)}
+_CONFIDENCE_INDEX = {level: i for i, level in enumerate(CONFIDENCE_LEVELS)}
+
+def compute_file_hash(file_path: Path) -> bytes:
+    """Compute the raw 32-byte SHA-256 digest of a file."""
     with open(file_path, 'rb') as f:
-        for chunk in iter(lambda: f.read(4096), b''):
+        # hashlib.file_digest (Python 3.11+) runs the read/update loop in C
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, _SHA256_PROTO.copy).digest()
+
+        sha256 = _SHA256_PROTO.copy()
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
             sha256.update(chunk)
-    return sha256.hexdigest()
+    return sha256.digest()
+
+
+def digest_matches(actual: Optional[bytes], expected_hex: str) -> bool:
+    """Constant-time check of a raw digest against an expected hex digest."""
+    if actual is None:
+        return False
+    try:
+        expected = bytes.fromhex(expected_hex)
+    except ValueError:
+        return False
+    return hmac.compare_digest(actual, expected)
 
 
-def load_sars(sar_dir: Path, manifest: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[str]]:
+def _load_sar(path: str) -> Tuple[Dict[str, Any], str]:
+    """
+    Parse a SAR file, returning it with the SHA-256 of its bytes.
+
+    Always reads the file afresh: the hash is checked against the validation
+    marker, so it must describe the bytes on disk now.
+    """
+    data = Path(path).read_bytes()
+    return orjson.loads(data), hashlib.sha256(data).hexdigest()
+
+
+def load_validation_marker(sar_dir: Path) -> Dict[str, str]:
+    """
+    Load the {pdb_id: sha256} map written by a strict generate_sar.py run.
+
+    Returns an empty map if the marker is missing, unreadable, or was
+    written against a different SAR schema.
+    """
+    marker_file = sar_dir / VALIDATION_MARKER
+    if not marker_file.exists():
+        return {}
+
+    try:
+        marker = orjson.loads(marker_file.read_bytes())
+    except orjson.JSONDecodeError:
+        return {}
+
+    if not isinstance(marker, dict) or marker.get("schema_sha256") != SAR_SCHEMA_SHA256:
+        return {}
+
+    return marker.get("sars", {})
+
+
+def load_sars(sar_dir: Path, manifest: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[str], List[str], Dict[str, np.ndarray]]:
     """
     Load all SARs for targets in manifest.
 
-    Returns (sars, missing_targets).
+    Returns (sars, missing_targets, prevalidated_targets, stats). A target is
+    prevalidated when its SAR file still matches the hash that
+    generate_sar.py recorded after strict validation. stats holds the
+    report columns encoded by encode_sar, folded in as each SAR is loaded.
     """
     targets = manifest["targets"]
-    sars = []
+    sar_ids = []
+    sar_paths = []
     missing = []
 
     for target in targets:
@@ -51,11 +128,54 @@ def load_sars(sar_dir: Path, manifest: Dict[str, Any]) -> Tuple[List[Dict[str, A
             missing.append(pdb_id)
             continue
 
-        with open(sar_file, 'r') as f:
-            sar = json.load(f)
-            sars.append(sar)
+        sar_ids.append(pdb_id)
+        sar_paths.append(str(sar_file))
 
-    return sars, missing
+    # Parse SARs concurrently; map() yields results in manifest order
+    with ThreadPoolExecutor(max_workers=min(32, max(1, len(sar_paths)))) as executor:
+        loaded = list(executor.map(_load_sar, sar_paths))
+
+    validated_hashes = load_validation_marker(sar_dir)
+    n = len(loaded)
+    sars = []
+    prevalidated = []
+    stats = {
+        "decision_gate": np.empty(n, dtype=np.intp),
+        "failure_class": np.empty(n, dtype=np.intp),
+        "confidence": np.empty(n, dtype=np.intp),
+        "rmsd_global": np.empty(n, dtype=np.float64)
+    }
+
+    # Single pass: collect, check the marker and encode each SAR while it is hot
+    for i, (pdb_id, (sar, sha256)) in enumerate(zip(sar_ids, loaded)):
+        sars.append(sar)
+        if validated_hashes.get(pdb_id) == sha256:
+            prevalidated.append(pdb_id)
+        (stats["decision_gate"][i], stats["failure_class"][i],
+         stats["confidence"][i], stats["rmsd_global"][i]) = encode_sar(sar)
+
+    return sars, missing, prevalidated, stats
+
+
+def encode_sar(sar: Dict[str, Any]) -> Tuple[int, int, int, float]:
+    """
+    Encode a SAR's report fields as (gate, failure class, confidence, rmsd_global).
+
+    Codes index DECISION_GATES / FAILURE_CLASSES / CONFIDENCE_LEVELS. Missing
+    or unrecognized values map to one past the end (and a missing RMSD to
+    NaN), so malformed SARs reach validate_sar_validity instead of failing
+    during load, and are never counted under a known label.
+    """
+    failure_taxonomy = sar.get("failure_taxonomy") or {}
+    confidence = sar.get("confidence_assessment") or {}
+    rmsd = (sar.get("metrics") or {}).get("rmsd_global")
+
+    return (
+        _GATE_INDEX.get(sar.get("decision_gate"), len(DECISION_GATES)),
+        _FAILURE_CLASS_INDEX.get(failure_taxonomy.get("class"), len(FAILURE_CLASSES)),
+        _CONFIDENCE_INDEX.get(confidence.get("overall_confidence"), len(CONFIDENCE_LEVELS)),
+        float(rmsd) if isinstance(rmsd, (int, float)) else np.nan
+    )
 
 
 def validate_completeness(sars: List[Dict[str, Any]], manifest: Dict[str, Any]) -> bool:
@@ -76,29 +196,25 @@ def validate_completeness(sars: List[Dict[str, Any]], manifest: Dict[str, Any])
     return True
 
 
-def validate_sar_validity(sars: List[Dict[str, Any]]) -> bool:
+def validate_sar_validity(sars: List[Dict[str, Any]], prevalidated: Optional[List[str]] = None) -> bool:
     """
     Validate SAR validity: 100% contain decision_gate.
 
     PASS criteria: 100% of SARs contain decision_gate (ACCEPT/REVIEW/REJECT).
     FAIL condition: Any SAR field missing or null.
+
+    Each SAR is checked against schemas/sar_schema_v1.json, except those in
+    prevalidated (already validated by generate_sar.py --strict_mode).
     """
     invalid_sars = []
+    skip = set(prevalidated or ())
 
     for sar in sars:
         pdb_id = sar.get("pdb_id", "unknown")
+        if pdb_id in skip:
+            continue
 
-        # Check required fields
-        if "decision_gate" not in sar or sar["decision_gate"] is None:
-            invalid_sars.append(f"{pdb_id}: missing decision_gate")
-        elif sar["decision_gate"] not in ["ACCEPT", "REVIEW", "REJECT"]:
-            invalid_sars.append(f"{pdb_id}: invalid decision_gate value")
-
-        if "expected_error_range" not in sar or sar["expected_error_range"] is None:
-            invalid_sars.append(f"{pdb_id}: missing expected_error_range")
-
-        if "recommended_action" not in sar or sar["recommended_action"] is None:
-            invalid_sars.append(f"{pdb_id}: missing recommended_action")
+        invalid_sars.extend(f"{pdb_id}: {error}" for error in schema_errors(sar))
 
     if invalid_sars:
         print(f"FAIL: SAR validity check failed", file=sys.stderr)
@@ -106,23 +222,38 @@ def validate_sar_validity(sars: List[Dict[str, Any]]) -> bool:
             print(f"  - {error}", file=sys.stderr)
         return False
 
-    print(f"✓ SAR Validity: All {len(sars)} SARs contain required fields")
+    skipped = sum(1 for sar in sars if sar.get("pdb_id") in skip)
+    if skipped:
+        print(f"✓ SAR Validity: All {len(sars)} SARs contain required fields ({skipped} verified by generate_sar.py strict mode)")
+    else:
+        print(f"✓ SAR Validity: All {len(sars)} SARs contain required fields")
     return True
 
 
-def generate_summary(sars: List[Dict[str, Any]], output_dir: Path) -> None:
-    """Generate SAR_SUMMARY.md with decision gate counts and failure taxonomy."""
+def generate_summary(sars: List[Dict[str, Any]], output_dir: Path, timestamp: str,
+                     stats: Dict[str, np.ndarray]) -> None:
+    """
+    Generate SAR_SUMMARY.md with decision gate counts and failure taxonomy.
+
+    stats holds the encoded report columns from load_sars.
+    """
 
     # Count decision gates
-    decision_counts = Counter(sar["decision_gate"] for sar in sars)
+    decision_counts = dict(zip(
+        DECISION_GATES,
+        np.bincount(stats["decision_gate"], minlength=len(DECISION_GATES)).tolist()
+    ))
 
     # Count failure classes
-    failure_counts = Counter(sar["failure_taxonomy"]["class"] for sar in sars)
+    failure_counts = dict(zip(
+        FAILURE_CLASSES,
+        np.bincount(stats["failure_class"], minlength=len(FAILURE_CLASSES)).tolist()
+    ))
 
     # Generate markdown
-    summary_md = f"""# Kinase Reliability Pilot v1.0 - SAR Summary
+    parts = [f"""# Kinase Reliability Pilot v1.0 - SAR Summary
 
-**Generated:** {datetime.utcnow().isoformat()}Z
+**Generated:** {timestamp}
 **Total Targets:** {len(sars)}
 
 ## Decision Gate Distribution
@@ -147,57 +278,75 @@ def generate_summary(sars: List[Dict[str, Any]], output_dir: Path) -> None:
 
 | PDB ID | Decision Gate | Failure Class | RMSD (Å) | pLDDT | Confidence |
 |--------|--------------|---------------|----------|-------|------------|
-"""
-
-    for sar in sorted(sars, key=lambda x: x["pdb_id"]):
-        pdb_id = sar["pdb_id"]
-        gate = sar["decision_gate"]
-        fail_class = sar["failure_taxonomy"]["class"]
-        rmsd = sar["metrics"]["rmsd_global"]
-        plddt = sar["metrics"]["plddt_mean"]
-        conf = sar["confidence_assessment"]["overall_confidence"]
-
-        summary_md += f"| {pdb_id} | {gate} | {fail_class} | {rmsd:.2f} | {plddt:.1f} | {conf} |\n"
+"""]
+
+    # Sort rows by PDB ID with a C-level argsort over the fixed-width ID array
+    pdb_ids = np.array([sar["pdb_id"] for sar in sars], dtype=str)
+    ordered = [sars[idx] for idx in np.argsort(pdb_ids, kind="stable")]
+
+    # Build the table column-wise; each numeric column is formatted in one vectorized call
+    columns = [
+        [sar["pdb_id"] for sar in ordered],
+        [sar["decision_gate"] for sar in ordered],
+        [sar["failure_taxonomy"]["class"] for sar in ordered],
+        np.char.mod("%.2f", np.array([sar["metrics"]["rmsd_global"] for sar in ordered], dtype=np.float64)).tolist(),
+        np.char.mod("%.1f", np.array([sar["metrics"]["plddt_mean"] for sar in ordered], dtype=np.float64)).tolist(),
+        [sar["confidence_assessment"]["overall_confidence"] for sar in ordered]
+    ]
+    parts.extend(f"| {' | '.join(cells)} |\n" for cells in zip(*columns))
 
     # Write summary
     summary_file = output_dir / "SAR_SUMMARY.md"
     with open(summary_file, 'w') as f:
-        f.write(summary_md)
+        f.write("".join(parts))
 
     print(f"Generated: {summary_file}")
 
 
-def generate_calibration_report(sars: List[Dict[str, Any]], output_dir: Path) -> bool:
+def generate_calibration_report(sars: List[Dict[str, Any]], output_dir: Path, timestamp: str,
+                                stats: Dict[str, np.ndarray]) -> bool:
     """
     Generate calibration_report.json with confidence-vs-error bands.
 
     PASS criteria: >= 3 confidence bins with error bars.
     FAIL condition: < 3 bins or missing error distribution.
-    """
-    # Group by confidence level
-    confidence_bins = {"high": [], "medium": [], "low": []}
 
-    for sar in sars:
-        conf = sar["confidence_assessment"]["overall_confidence"]
-        rmsd = sar["metrics"]["rmsd_global"]
-        confidence_bins[conf].append(rmsd)
+    stats holds the encoded report columns from load_sars.
+    """
+    # Take each SAR's (confidence bin index, RMSD) and sort by bin so every
+    # bin is a contiguous slice that the reduceat kernels can sweep in one pass
+    known = stats["confidence"] < len(CONFIDENCE_LEVELS)
+    conf_idx = stats["confidence"][known]
+    rmsd_arr = stats["rmsd_global"][known]
+    order = np.argsort(conf_idx, kind="stable")
+    rmsd_arr = rmsd_arr[order]
+
+    counts = np.bincount(conf_idx, minlength=len(CONFIDENCE_LEVELS))
+    bounds = np.concatenate(([0], np.cumsum(counts)))
+    present = np.flatnonzero(counts)
 
     # Compute statistics for each bin
     calibration_data = {}
-    bins_with_data = 0
-
-    for conf_level, rmsd_values in confidence_bins.items():
-        if len(rmsd_values) > 0:
-            import numpy as np
-            calibration_data[conf_level] = {
-                "n_samples": len(rmsd_values),
-                "rmsd_mean": float(np.mean(rmsd_values)),
-                "rmsd_std": float(np.std(rmsd_values)),
-                "rmsd_min": float(np.min(rmsd_values)),
-                "rmsd_max": float(np.max(rmsd_values)),
-                "rmsd_median": float(np.median(rmsd_values))
+    bins_with_data = int(present.size)
+
+    if bins_with_data > 0:
+        starts = bounds[present]
+        n_samples = counts[present]
+        means = np.add.reduceat(rmsd_arr, starts) / n_samples
+        deviations = rmsd_arr - np.repeat(means, n_samples)
+        stds = np.sqrt(np.add.reduceat(deviations * deviations, starts) / n_samples)
+        mins = np.minimum.reduceat(rmsd_arr, starts)
+        maxs = np.maximum.reduceat(rmsd_arr, starts)
+
+        for j, b in enumerate(present):
+            calibration_data[CONFIDENCE_LEVELS[b]] = {
+                "n_samples": int(n_samples[j]),
+                "rmsd_mean": float(means[j]),
+                "rmsd_std": float(stds[j]),
+                "rmsd_min": float(mins[j]),
+                "rmsd_max": float(maxs[j]),
+                "rmsd_median": float(np.median(rmsd_arr[bounds[b]:bounds[b + 1]]))
             }
-            bins_with_data += 1
 
     # Check PASS criteria
     if bins_with_data < 3:
@@ -205,7 +354,7 @@ def generate_calibration_report(sars: List[Dict[str, Any]], output_dir: Path) ->
 
     calibration_report = {
         "version": "1.0",
-        "generated": datetime.utcnow().isoformat() + "Z",
+        "generated": timestamp,
         "total_targets": len(sars),
         "confidence_bins": bins_with_data,
         "calibration_data": calibration_data,
@@ -227,15 +376,29 @@ def generate_calibration_report(sars: List[Dict[str, Any]], output_dir: Path) ->
     return bins_with_data >= 3
 
 
-def generate_execution_provenance(args, manifest_path: Path, output_dir: Path) -> None:
+def generate_execution_provenance(args, manifest_path: Path, output_dir: Path, timestamp: str) -> None:
     """
     Generate execution_provenance.json with full runtime config.
 
     PASS criteria: File includes full command line & timestamps.
     FAIL condition: Missing provenance file.
     """
-    # Compute manifest hashes for verification
-    accepted_hash = compute_file_hash(Path(args.manifest))
+    # Compute manifest hashes for verification; hashlib releases the GIL on
+    # large buffers, so the two files hash concurrently
+    if args.rejected_manifest:
+        rejected_path = Path(args.rejected_manifest)
+    else:
+        rejected_path = manifest_path.with_name(f"{manifest_path.stem}_rejected{manifest_path.suffix}")
+
+    hash_paths = [manifest_path]
+    if rejected_path.exists():
+        hash_paths.append(rejected_path)
+
+    with ThreadPoolExecutor(max_workers=len(hash_paths)) as executor:
+        hashes = list(executor.map(compute_file_hash, hash_paths))
+
+    accepted_hash = hashes[0]
+    rejected_hash = hashes[1] if len(hashes) > 1 else None
 
     # Build full command line (reconstructed)
     command_line = f"python3 compile_reports.py " \
@@ -244,24 +407,31 @@ def generate_execution_provenance(args, manifest_path: Path, output_dir: Path) -
                   f"--job_id {args.job_id} " \
                   f"--accepted_manifest_hash {args.accepted_manifest_hash} " \
                   f"--rejected_manifest_hash {args.rejected_manifest_hash}"
+    if args.rejected_manifest:
+        command_line += f" --rejected_manifest {args.rejected_manifest}"
 
     provenance = {
         "job_id": args.job_id,
         "job_type": "compile_reports",
         "version": "1.0",
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": timestamp,
         "command_line": command_line,
         "arguments": {
             "manifest": args.manifest,
             "sar_dir": args.sar_dir,
             "job_id": args.job_id,
             "accepted_manifest_hash": args.accepted_manifest_hash,
-            "rejected_manifest_hash": args.rejected_manifest_hash
+            "rejected_manifest_hash": args.rejected_manifest_hash,
+            "rejected_manifest": args.rejected_manifest
         },
         "manifest_verification": {
             "accepted_manifest_hash_expected": args.accepted_manifest_hash,
-            "accepted_manifest_hash_actual": accepted_hash,
-            "hash_match": accepted_hash == args.accepted_manifest_hash
+            "accepted_manifest_hash_actual": accepted_hash.hex(),
+            "hash_match": digest_matches(accepted_hash, args.accepted_manifest_hash),
+            "rejected_manifest": str(rejected_path),
+            "rejected_manifest_hash_expected": args.rejected_manifest_hash,
+            "rejected_manifest_hash_actual": rejected_hash.hex() if rejected_hash is not None else None,
+            "rejected_hash_match": digest_matches(rejected_hash, args.rejected_manifest_hash)
         },
         "locked_parameters": {
             "seed": 42,
@@ -314,9 +484,17 @@ def main():
         required=True,
         help="Expected SHA-256 hash of rejected manifest"
     )
+    parser.add_argument(
+        "--rejected_manifest",
+        default=None,
+        help="Path to rejected manifest JSON (default: <manifest>_rejected.json beside --manifest)"
+    )
 
     args = parser.parse_args()
 
+    # All reports from one run share a single generation timestamp
+    run_timestamp = utc_timestamp()
+
     print(f"{'='*60}")
     print(f"Kinase Reliability Pilot v1.0 - Report Compilation")
     print(f"Job ID: {args.job_id}")
@@ -325,13 +503,12 @@ def main():
     # Load manifest
     manifest_path = Path(args.manifest)
     print(f"Loading manifest: {args.manifest}")
-    with open(manifest_path, 'r') as f:
-        manifest = json.load(f)
+    manifest = orjson.loads(manifest_path.read_bytes())
 
     # Load SARs
     sar_dir = Path(args.sar_dir)
     print(f"Loading SARs from: {args.sar_dir}")
-    sars, missing = load_sars(sar_dir, manifest)
+    sars, missing, prevalidated, stats = load_sars(sar_dir, manifest)
 
     if missing:
         print(f"\nERROR: Missing SARs for targets: {', '.join(missing)}", file=sys.stderr)
@@ -348,7 +525,7 @@ def main():
         all_passed = False
 
     # Check SAR validity
-    if not validate_sar_validity(sars):
+    if not validate_sar_validity(sars, prevalidated):
         all_passed = False
 
     if not all_passed:
@@ -361,9 +538,9 @@ def main():
     print("Generating reports...")
     output_dir = sar_dir  # Write reports to SAR directory
 
-    generate_summary(sars, output_dir)
-    calibration_passed = generate_calibration_report(sars, output_dir)
-    generate_execution_provenance(args, manifest_path, output_dir)
+    generate_summary(sars, output_dir, run_timestamp, stats)
+    calibration_passed = generate_calibration_report(sars, output_dir, run_timestamp, stats)
+    generate_execution_provenance(args, manifest_path, output_dir, run_timestamp)
 
     print(f"\n{'='*60}")
 
@@ -11,13 +11,45 @@ Missing any required field => ERROR_SAR_INCOMPLETE
 """
 
 import argparse
+import base64
+import hashlib
 import json
 import os
 import sys
-from datetime import datetime
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple, Union
 import numpy as np
+import orjson
+from jsonschema import Draft7Validator
+
+# Locked pilot seed; also seeds the stub metric draws
+LOCKED_SEED = 42
+
+# Integer codes used by classify_batch (index into these tuples)
+CONFIDENCE_LEVELS = ("high", "medium", "low")
+FAILURE_CLASSES = ("N/A", "Class A", "Class B", "Class C", "Unknown")
+DECISION_GATES = ("ACCEPT", "REVIEW", "REJECT")
+
+# Expected rmsd_max per confidence level (matches determine_expected_error_range)
+EXPECTED_RMSD_MAX = np.array([2.0, 4.0, 8.0])
+
+# SAR schema, compiled into a validator once at import
+SAR_SCHEMA_PATH = Path(__file__).resolve().parent / "schemas" / "sar_schema_v1.json"
+_SAR_SCHEMA_BYTES = SAR_SCHEMA_PATH.read_bytes()
+_SAR_SCHEMA = json.loads(_SAR_SCHEMA_BYTES)
+SAR_SCHEMA_SHA256 = hashlib.sha256(_SAR_SCHEMA_BYTES).hexdigest()
+Draft7Validator.check_schema(_SAR_SCHEMA)
+_SAR_VALIDATOR = Draft7Validator(_SAR_SCHEMA)
+
+# Binary ground truth layout produced by scripts/convert_ground_truth.py
+GT_COORDS_SUFFIX = ".coords.npy"
+GT_META_SUFFIX = ".meta.json"
+
+# Written to the SAR directory after a strict-mode run; read by compile_reports.py
+VALIDATION_MARKER = ".validated.json"
 
 
 class SARValidationError(Exception):
@@ -25,19 +57,40 @@ class SARValidationError(Exception):
     pass
 
 
-def compute_rmsd_stub(pred_coords: List[List[float]], gt_coords: Optional[List[List[float]]]) -> float:
+def utc_timestamp() -> str:
+    """Current UTC time as ISO 8601 with a Z suffix (second precision)."""
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def decode_coordinates(prediction: Dict[str, Any]) -> np.ndarray:
+    """
+    Return a prediction's coordinates as an (n_residues, 3) array.
+
+    Accepts the base64 blob written by run_inference.py (coordinates_b64 plus
+    coordinates_dtype) as well as a plain nested "coordinates" list.
+    """
+    if "coordinates_b64" in prediction:
+        dtype = np.dtype(prediction.get("coordinates_dtype", "float32"))
+        return np.frombuffer(base64.b64decode(prediction["coordinates_b64"]), dtype=dtype).reshape(-1, 3)
+    return np.asarray(prediction["coordinates"])
+
+
+def compute_rmsd_stub(pred_coords: Union[List[List[float]], np.ndarray],
+                      gt_coords: Optional[Union[List[List[float]], np.ndarray]],
+                      stub_rmsd: float) -> float:
     """
     Compute stub RMSD (deterministic for demo).
 
     In production, would compute actual RMSD between predicted and ground truth coordinates.
+    stub_rmsd is returned when no ground truth is available.
     """
     if gt_coords is None:
         # No ground truth available - return deterministic stub value
-        return np.random.uniform(1.5, 4.5)
+        return stub_rmsd
 
-    # Simplified RMSD calculation for stub
-    pred = np.array(pred_coords)
-    gt = np.array(gt_coords)
+    # Simplified RMSD calculation for stub (asarray: memory-mapped ground truth is not copied)
+    pred = np.asarray(pred_coords)
+    gt = np.asarray(gt_coords)
 
     if pred.shape != gt.shape:
         # Handle size mismatch
@@ -45,7 +98,9 @@ def compute_rmsd_stub(pred_coords: List[List[float]], gt_coords: Optional[List[L
         pred = pred[:min_len]
         gt = gt[:min_len]
 
-    return float(np.sqrt(np.mean(np.sum((pred - gt)**2, axis=1))))
+    # Fused sum of squared deviations; avoids the (pred - gt)**2 and row-sum temporaries
+    diff = np.subtract(pred, gt)
+    return float(np.sqrt(np.einsum('ij,ij->', diff, diff) / diff.shape[0]))
 
 
 def classify_confidence(plddt_mean: float, pae_mean: float) -> Dict[str, str]:
@@ -124,42 +179,49 @@ def classify_failure(rmsd_global: float, rmsd_ligand: Any, plddt_mean: float,
 
     # Check if prediction is within expected error range
     if rmsd_global <= rmsd_max:
-        return {
-            "class": "N/A",
-            "description": f"Prediction within expected error range (RMSD={rmsd_global:.2f}Å <= {rmsd_max:.2f}Å)"
-        }
+        failure_class = "N/A"
 
     # Failure detected - classify
 
     # Class A: Overconfidence artifact (high confidence but high error)
-    if plddt_mean > 90 and pae_mean < 5 and rmsd_global > rmsd_max * 1.5:
-        return {
-            "class": "Class A",
-            "description": f"Overconfidence artifact: High model confidence (pLDDT={plddt_mean:.1f}, PAE={pae_mean:.1f}) but RMSD={rmsd_global:.2f}Å exceeds expected range"
-        }
+    elif plddt_mean > 90 and pae_mean < 5 and rmsd_global > rmsd_max * 1.5:
+        failure_class = "Class A"
 
     # Class B: Ligand pose failure
-    if ligand_present and isinstance(rmsd_ligand, (int, float)):
-        if rmsd_ligand > rmsd_global * 1.5:
-            return {
-                "class": "Class B",
-                "description": f"Ligand pose failure: Ligand pocket RMSD ({rmsd_ligand:.2f}Å) significantly exceeds global RMSD ({rmsd_global:.2f}Å)"
-            }
+    elif (ligand_present and isinstance(rmsd_ligand, (int, float))
+          and rmsd_ligand > rmsd_global * 1.5):
+        failure_class = "Class B"
 
     # Class C: Symmetry/assembly failure (heuristic: very high error with specific pattern)
-    if rmsd_global > 10.0:
-        return {
-            "class": "Class C",
-            "description": f"Potential symmetry/assembly failure: Extremely high RMSD ({rmsd_global:.2f}Å) suggests structural misalignment"
-        }
+    elif rmsd_global > 10.0:
+        failure_class = "Class C"
 
     # Unknown failure mode
+    else:
+        failure_class = "Unknown"
+
     return {
-        "class": "Unknown",
-        "description": f"Unmapped failure mode: RMSD={rmsd_global:.2f}Å exceeds expected range but doesn't match known failure patterns"
+        "class": failure_class,
+        "description": describe_failure(
+            failure_class, rmsd_global, rmsd_ligand, plddt_mean, pae_mean, rmsd_max
+        )
     }
 
 
+def describe_failure(failure_class: str, rmsd_global: float, rmsd_ligand: Any,
+                     plddt_mean: float, pae_mean: float, rmsd_max: float) -> str:
+    """Build the human-readable description for a failure class."""
+    if failure_class == "N/A":
+        return f"Prediction within expected error range (RMSD={rmsd_global:.2f}Å <= {rmsd_max:.2f}Å)"
+    if failure_class == "Class A":
+        return f"Overconfidence artifact: High model confidence (pLDDT={plddt_mean:.1f}, PAE={pae_mean:.1f}) but RMSD={rmsd_global:.2f}Å exceeds expected range"
+    if failure_class == "Class B":
+        return f"Ligand pose failure: Ligand pocket RMSD ({rmsd_ligand:.2f}Å) significantly exceeds global RMSD ({rmsd_global:.2f}Å)"
+    if failure_class == "Class C":
+        return f"Potential symmetry/assembly failure: Extremely high RMSD ({rmsd_global:.2f}Å) suggests structural misalignment"
+    return f"Unmapped failure mode: RMSD={rmsd_global:.2f}Å exceeds expected range but doesn't match known failure patterns"
+
+
 def determine_decision_gate(rmsd_global: float, expected_range: Dict[str, float],
                            failure_class: str, confidence: Dict[str, str]) -> str:
     """
@@ -181,6 +243,43 @@ def determine_decision_gate(rmsd_global: float, expected_range: Dict[str, float]
     return "REVIEW"
 
 
+def classify_batch(plddt_mean: np.ndarray, pae_mean: np.ndarray, rmsd_global: np.ndarray,
+                   rmsd_ligand: np.ndarray, ligand_present: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Vectorized classify_confidence + classify_failure + determine_decision_gate.
+
+    rmsd_ligand is NaN where no ligand pocket RMSD exists. Returns integer-coded
+    arrays: plddt_bin/pae_bin/overall_confidence index CONFIDENCE_LEVELS,
+    failure_class indexes FAILURE_CLASSES and decision_gate indexes DECISION_GATES.
+    """
+    # Confidence bins: 0=high, 1=medium, 2=low
+    plddt_bin = np.where(plddt_mean > 90, 0, np.where(plddt_mean > 70, 1, 2))
+    pae_bin = np.where(pae_mean < 5, 0, np.where(pae_mean < 10, 1, 2))
+    overall = np.where((plddt_bin == 0) & (pae_bin == 0), 0,
+                       np.where((plddt_bin == 2) | (pae_bin == 2), 2, 1))
+
+    # Failure taxonomy, in the same precedence order as classify_failure
+    rmsd_max = EXPECTED_RMSD_MAX[overall]
+    within_range = rmsd_global <= rmsd_max
+    class_a = (plddt_mean > 90) & (pae_mean < 5) & (rmsd_global > rmsd_max * 1.5)
+    with np.errstate(invalid="ignore"):
+        class_b = ligand_present & (rmsd_ligand > rmsd_global * 1.5)
+    class_c = rmsd_global > 10.0
+    failure_class = np.select([within_range, class_a, class_b, class_c], [0, 1, 2, 3], default=4)
+
+    # Decision gates, in the same precedence order as determine_decision_gate
+    reject = (failure_class == 1) | (failure_class == 3) | (rmsd_global > rmsd_max * 2)
+    decision_gate = np.select([within_range, reject], [0, 2], default=1)
+
+    return {
+        "plddt_bin": plddt_bin,
+        "pae_bin": pae_bin,
+        "overall_confidence": overall,
+        "failure_class": failure_class,
+        "decision_gate": decision_gate
+    }
+
+
 def generate_recommended_action(decision_gate: str, failure_taxonomy: Dict[str, str],
                                pdb_id: str) -> str:
     """
@@ -210,139 +309,317 @@ def generate_recommended_action(decision_gate: str, failure_taxonomy: Dict[str,
             return f"Reject {pdb_id}: Error exceeds acceptable thresholds. Do not use for downstream analysis without significant refinement."
 
 
+def schema_errors(sar: Dict[str, Any]) -> List[str]:
+    """List SAR schema violations as "field.path: message" strings."""
+    errors = sorted(_SAR_VALIDATOR.iter_errors(sar), key=lambda e: list(map(str, e.path)))
+    return [
+        f"{'.'.join(map(str, e.path))}: {e.message}" if e.path else e.message
+        for e in errors
+    ]
+
+
 def validate_sar(sar: Dict[str, Any], strict_mode: bool = True) -> None:
     """
-    Validate SAR contains all required fields.
+    Validate SAR against schemas/sar_schema_v1.json.
 
-    In strict mode, raises SARValidationError if any required field missing.
+    In strict mode, raises SARValidationError if any required field is
+    missing, null or invalid.
     """
-    required_fields = [
-        "expected_error_range",
-        "recommended_action",
-        "decision_gate"
-    ]
+    errors = schema_errors(sar)
 
-    missing_fields = []
-    for field in required_fields:
-        if field not in sar or sar[field] is None:
-            missing_fields.append(field)
+    if errors and strict_mode:
+        raise SARValidationError(f"ERROR_SAR_INCOMPLETE: Schema violations: {'; '.join(errors)}")
 
-    # Validate expected_error_range structure
-    if "expected_error_range" in sar and sar["expected_error_range"] is not None:
-        err_range = sar["expected_error_range"]
-        for subfield in ["rmsd_min", "rmsd_max", "rationale"]:
-            if subfield not in err_range or err_range[subfield] is None:
-                missing_fields.append(f"expected_error_range.{subfield}")
+    if errors:
+        print(f"WARNING: SAR validation failed: {'; '.join(errors)}", file=sys.stderr)
 
-    # Validate decision_gate enum
-    if "decision_gate" in sar and sar["decision_gate"] is not None:
-        if sar["decision_gate"] not in ["ACCEPT", "REVIEW", "REJECT"]:
-            missing_fields.append("decision_gate (invalid value)")
 
-    if missing_fields and strict_mode:
-        raise SARValidationError(f"ERROR_SAR_INCOMPLETE: Missing required fields: {', '.join(missing_fields)}")
+def write_validation_marker(output_dir: Path, sar_hashes: Dict[str, str]) -> None:
+    """
+    Record the SHA-256 of every SAR file that passed strict validation.
 
-    if missing_fields:
-        print(f"WARNING: SAR validation failed: Missing fields: {', '.join(missing_fields)}", file=sys.stderr)
+    compile_reports.py skips re-validating SARs whose bytes still match.
+    """
+    marker = {
+        "schema_sha256": SAR_SCHEMA_SHA256,
+        "sars": sar_hashes
+    }
+    with open(output_dir / VALIDATION_MARKER, 'wb') as f:
+        f.write(orjson.dumps(marker, option=orjson.OPT_INDENT_2))
 
 
-def generate_sar(target: Dict[str, Any], prediction: Dict[str, Any],
-                ground_truth: Optional[Dict[str, Any]], args) -> Dict[str, Any]:
-    """Generate a complete SAR for a single target."""
-    pdb_id = target["pdb_id"]
+def draw_stub_metrics(n_targets: int, seed: int = LOCKED_SEED) -> Dict[str, np.ndarray]:
+    """
+    Draw the stub metric values for all targets in one pass.
+
+    Index i of each array belongs to the i-th target in manifest order.
+    """
+    rng = np.random.default_rng(seed)
+    return {
+        "rmsd": rng.uniform(1.5, 4.5, n_targets),
+        "ligand_factor": rng.uniform(0.8, 1.5, n_targets),
+        "contact_map_overlap": rng.uniform(0.6, 0.95, n_targets)
+    }
+
 
-    # Load prediction data
-    plddt_scores = np.array(prediction["plddt"])
-    pae_matrix = np.array(prediction["pae"])
+def compute_metrics(target: Dict[str, Any], prediction: Dict[str, Any],
+                    ground_truth: Optional[Dict[str, Any]],
+                    stubs: Dict[str, float]) -> Dict[str, Any]:
+    """
+    Compute the unrounded SAR metrics for a single target.
 
-    # Compute metrics
-    plddt_mean = float(np.mean(plddt_scores))
-    pae_mean = float(np.mean(pae_matrix))
+    stubs holds this target's pre-drawn stub values (see draw_stub_metrics).
+    """
+    # Load prediction data (float32 halves the bytes touched by the reductions)
+    plddt_scores = np.asarray(prediction["plddt"], dtype=np.float32)
+    pae_matrix = np.asarray(prediction["pae"], dtype=np.float32)
+
+    # Compute metrics (accumulate in float64 to keep the means exact to 2 d.p.)
+    plddt_mean = float(plddt_scores.mean(dtype=np.float64))
+    pae_mean = float(pae_matrix.mean(dtype=np.float64))
 
     # Compute RMSD (stub implementation)
     rmsd_global = compute_rmsd_stub(
-        prediction["coordinates"],
-        ground_truth["coordinates"] if ground_truth else None
+        decode_coordinates(prediction),
+        ground_truth["coordinates"] if ground_truth else None,
+        stubs["rmsd"]
     )
 
     # Compute ligand pocket RMSD if applicable
-    ligand_present = target.get("ligand_present", False)
-    if ligand_present:
+    if target.get("ligand_present", False):
         # Stub: ligand RMSD is global RMSD * random factor
-        rmsd_ligand_pocket = rmsd_global * np.random.uniform(0.8, 1.5)
+        rmsd_ligand_pocket = rmsd_global * stubs["ligand_factor"]
     else:
         rmsd_ligand_pocket = "N/A"
 
     # Contact map overlap (stub)
-    contact_map_overlap = float(np.random.uniform(0.6, 0.95))
+    contact_map_overlap = stubs["contact_map_overlap"]
 
-    # Classify confidence
-    confidence_assessment = classify_confidence(plddt_mean, pae_mean)
+    return {
+        "rmsd_global": rmsd_global,
+        "rmsd_ligand_pocket": rmsd_ligand_pocket,
+        "contact_map_overlap": contact_map_overlap,
+        "plddt_mean": plddt_mean,
+        "pae_mean": pae_mean
+    }
 
-    # Determine expected error range (REQUIRED)
-    expected_error_range = determine_expected_error_range(confidence_assessment)
 
-    # Classify failure mode
-    failure_taxonomy = classify_failure(
-        rmsd_global, rmsd_ligand_pocket, plddt_mean, pae_mean,
-        expected_error_range, ligand_present
-    )
+def extract_provenance(prediction: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the SAR provenance block from a prediction."""
+    return {
+        "model_version": prediction.get("model_version", "unknown"),
+        "seed": prediction.get("seed", -1),
+        "recycles": prediction.get("recycles", -1),
+        "stub_output": prediction.get("stub_output", False)
+    }
 
-    # Determine decision gate (REQUIRED)
-    decision_gate = determine_decision_gate(
-        rmsd_global, expected_error_range,
-        failure_taxonomy["class"], confidence_assessment
-    )
+
+def build_sar(target: Dict[str, Any], metrics: Dict[str, Any],
+              confidence_assessment: Dict[str, str], expected_error_range: Dict[str, Any],
+              failure_taxonomy: Dict[str, str], decision_gate: str,
+              provenance: Dict[str, Any], timestamp: str) -> Dict[str, Any]:
+    """Assemble a SAR from its computed metrics and classifications."""
+    pdb_id = target["pdb_id"]
+    rmsd_ligand_pocket = metrics["rmsd_ligand_pocket"]
 
     # Generate recommended action (REQUIRED)
     recommended_action = generate_recommended_action(
         decision_gate, failure_taxonomy, pdb_id
     )
 
-    # Build SAR
-    sar = {
+    return {
         "pdb_id": pdb_id,
         "sar_version": "1.0",
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": timestamp,
         "metrics": {
-            "rmsd_global": round(rmsd_global, 2),
+            "rmsd_global": round(metrics["rmsd_global"], 2),
             "rmsd_ligand_pocket": round(rmsd_ligand_pocket, 2) if isinstance(rmsd_ligand_pocket, (int, float)) else rmsd_ligand_pocket,
-            "contact_map_overlap": round(contact_map_overlap, 3),
-            "plddt_mean": round(plddt_mean, 2),
-            "pae_mean": round(pae_mean, 2)
+            "contact_map_overlap": round(metrics["contact_map_overlap"], 3),
+            "plddt_mean": round(metrics["plddt_mean"], 2),
+            "pae_mean": round(metrics["pae_mean"], 2)
         },
         "confidence_assessment": confidence_assessment,
         "expected_error_range": expected_error_range,
         "recommended_action": recommended_action,
         "decision_gate": decision_gate,
         "failure_taxonomy": failure_taxonomy,
-        "provenance": {
-            "model_version": prediction.get("model_version", "unknown"),
-            "seed": prediction.get("seed", -1),
-            "recycles": prediction.get("recycles", -1),
-            "stub_output": prediction.get("stub_output", False)
-        }
+        "provenance": provenance
     }
 
-    return sar
 
+def generate_sar(target: Dict[str, Any], prediction: Dict[str, Any],
+                ground_truth: Optional[Dict[str, Any]], args,
+                stubs: Dict[str, float]) -> Dict[str, Any]:
+    """
+    Generate a complete SAR for a single target.
+
+    Single-target path using the scalar classifiers; main() classifies the
+    whole batch at once via generate_sar_batch.
+    """
+    metrics = compute_metrics(target, prediction, ground_truth, stubs)
+    rmsd_global = metrics["rmsd_global"]
+    plddt_mean = metrics["plddt_mean"]
+    pae_mean = metrics["pae_mean"]
+
+    # Classify confidence
+    confidence_assessment = classify_confidence(plddt_mean, pae_mean)
+
+    # Determine expected error range (REQUIRED)
+    expected_error_range = determine_expected_error_range(confidence_assessment)
+
+    # Classify failure mode
+    failure_taxonomy = classify_failure(
+        rmsd_global, metrics["rmsd_ligand_pocket"], plddt_mean, pae_mean,
+        expected_error_range, target.get("ligand_present", False)
+    )
+
+    # Determine decision gate (REQUIRED)
+    decision_gate = determine_decision_gate(
+        rmsd_global, expected_error_range,
+        failure_taxonomy["class"], confidence_assessment
+    )
+
+    return build_sar(
+        target, metrics, confidence_assessment, expected_error_range,
+        failure_taxonomy, decision_gate, extract_provenance(prediction),
+        utc_timestamp()
+    )
+
+
+def generate_sar_batch(records: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]],
+                       timestamp: str) -> List[Dict[str, Any]]:
+    """
+    Generate SARs for a batch of targets with a single classify_batch call.
+
+    records is a list of (target, metrics, provenance) tuples as produced by
+    compute_metrics and extract_provenance. All SARs share timestamp.
+    SARs are returned in record order.
+    """
+    n = len(records)
+    plddt_mean = np.fromiter((m["plddt_mean"] for _, m, _ in records), dtype=np.float64, count=n)
+    pae_mean = np.fromiter((m["pae_mean"] for _, m, _ in records), dtype=np.float64, count=n)
+    rmsd_global = np.fromiter((m["rmsd_global"] for _, m, _ in records), dtype=np.float64, count=n)
+    rmsd_ligand = np.fromiter(
+        (m["rmsd_ligand_pocket"] if isinstance(m["rmsd_ligand_pocket"], (int, float)) else np.nan
+         for _, m, _ in records),
+        dtype=np.float64, count=n
+    )
+    ligand_present = np.fromiter(
+        (bool(t.get("ligand_present", False)) for t, _, _ in records), dtype=bool, count=n
+    )
+
+    codes = classify_batch(plddt_mean, pae_mean, rmsd_global, rmsd_ligand, ligand_present)
+
+    # Bind everything the assembly loop touches to locals: plain-int code
+    # lists instead of per-element ndarray indexing, and functions/constants
+    # as LOAD_FAST instead of global lookups
+    plddt_bins = codes["plddt_bin"].tolist()
+    pae_bins = codes["pae_bin"].tolist()
+    overall_bins = codes["overall_confidence"].tolist()
+    failure_codes = codes["failure_class"].tolist()
+    gate_codes = codes["decision_gate"].tolist()
+    levels, failure_classes, gates = CONFIDENCE_LEVELS, FAILURE_CLASSES, DECISION_GATES
+    _expected_range = determine_expected_error_range
+    _describe = describe_failure
+    _build = build_sar
+
+    sars = []
+    _append = sars.append
+    for i, (target, metrics, provenance) in enumerate(records):
+        confidence_assessment = {
+            "plddt_bin": levels[plddt_bins[i]],
+            "pae_bin": levels[pae_bins[i]],
+            "overall_confidence": levels[overall_bins[i]]
+        }
+        expected_error_range = _expected_range(confidence_assessment)
+        failure_class = failure_classes[failure_codes[i]]
+        failure_taxonomy = {
+            "class": failure_class,
+            "description": _describe(
+                failure_class, metrics["rmsd_global"], metrics["rmsd_ligand_pocket"],
+                metrics["plddt_mean"], metrics["pae_mean"], expected_error_range["rmsd_max"]
+            )
+        }
+        _append(_build(
+            target, metrics, confidence_assessment, expected_error_range,
+            failure_taxonomy, gates[gate_codes[i]], provenance,
+            timestamp
+        ))
+
+    return sars
+
+
+def load_ground_truth(pdb_id: str, ground_truth_dir: Path,
+                      seed: int = LOCKED_SEED) -> Optional[Dict[str, Any]]:
+    """
+    Load ground truth structure if available.
+
+    Prefers the binary layout (<pdb_id>.coords.npy + <pdb_id>.meta.json),
+    whose coordinates are memory-mapped rather than parsed, and falls back
+    to <pdb_id>_ground_truth.json. When neither exists, stub coordinates are
+    drawn from a generator keyed on (seed, pdb_id), so they do not depend on
+    worker scheduling or global RNG state.
+    """
+    coords_file = ground_truth_dir / f"{pdb_id}{GT_COORDS_SUFFIX}"
+    if coords_file.exists():
+        meta_file = ground_truth_dir / f"{pdb_id}{GT_META_SUFFIX}"
+        if meta_file.exists():
+            ground_truth = orjson.loads(meta_file.read_bytes())
+        else:
+            ground_truth = {"pdb_id": pdb_id}
+        ground_truth["coordinates"] = np.load(coords_file, mmap_mode='r')
+        return ground_truth
 
-def load_ground_truth(pdb_id: str, ground_truth_dir: Path) -> Optional[Dict[str, Any]]:
-    """Load ground truth structure if available."""
     gt_file = ground_truth_dir / f"{pdb_id}_ground_truth.json"
 
     if not gt_file.exists():
         print(f"  Warning: No ground truth found for {pdb_id}", file=sys.stderr)
         # Generate stub ground truth for demo
+        rng = np.random.default_rng([seed, zlib.crc32(pdb_id.encode())])
         return {
             "pdb_id": pdb_id,
-            "coordinates": np.random.randn(300, 3).tolist()
+            "coordinates": rng.standard_normal((300, 3))
         }
 
     with open(gt_file, 'r') as f:
         return json.load(f)
 
 
+def _process_target(target: Dict[str, Any], pred_dir: Path, gt_dir: Path,
+                    stubs: Dict[str, float]) -> Tuple[str, Optional[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]], Optional[str]]:
+    """
+    Load one target's prediction and ground truth and compute its metrics.
+
+    Runs in a worker process. Returns (pdb_id, record, error) where record is
+    the (target, metrics, provenance) tuple for generate_sar_batch, or None
+    if the target failed with error.
+    """
+    pdb_id = target["pdb_id"]
+
+    try:
+        # Load prediction
+        # Predictions are sharded by the first two characters of the PDB id;
+        # fall back to the flat layout written by earlier runs
+        sharded_file = pred_dir / pdb_id[:2] / f"{pdb_id}_prediction.json"
+        flat_file = pred_dir / f"{pdb_id}_prediction.json"
+        pred_file = sharded_file if sharded_file.exists() else flat_file
+        if not pred_file.exists():
+            raise FileNotFoundError(f"Prediction not found: {sharded_file} (or flat layout {flat_file})")
+
+        with open(pred_file, 'rb') as f:
+            prediction = orjson.loads(f.read())
+
+        # Load ground truth
+        ground_truth = load_ground_truth(pdb_id, gt_dir)
+
+        # Compute metrics
+        metrics = compute_metrics(target, prediction, ground_truth, stubs)
+        return pdb_id, (target, metrics, extract_provenance(prediction)), None
+
+    except Exception as e:
+        return pdb_id, None, str(e)
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -378,9 +655,18 @@ def main():
         action="store_true",
         help="Enable strict validation (fail on missing required fields)"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for per-target metric computation (default: CPU count)"
+    )
 
     args = parser.parse_args()
 
+    # All SARs from one run share a single generation timestamp
+    run_timestamp = utc_timestamp()
+
     # Load manifest
     print(f"Loading manifest: {args.manifest}")
     with open(args.manifest, 'r') as f:
@@ -389,43 +675,77 @@ def main():
     targets = manifest["targets"]
     print(f"Found {len(targets)} targets")
 
+    # Draw stub metrics for every target up front from one seeded generator
+    stub_draws = draw_stub_metrics(len(targets))
+
     # Setup directories
     pred_dir = Path(args.pred_dir)
     gt_dir = Path(args.ground_truth_dir)
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Process each target
+    # Compute metrics for each target
     print(f"\nGenerating SARs (strict_mode={args.strict_mode})...")
     success_count = 0
     validation_errors = []
+    records = []
+    sar_hashes = {}
 
-    for i, target in enumerate(targets, 1):
-        pdb_id = target["pdb_id"]
-        print(f"[{i}/{len(targets)}] {pdb_id}...", end=" ")
-
-        try:
-            # Load prediction
-            pred_file = pred_dir / f"{pdb_id}_prediction.json"
-            if not pred_file.exists():
-                raise FileNotFoundError(f"Prediction not found: {pred_file}")
-
-            with open(pred_file, 'r') as f:
-                prediction = json.load(f)
-
-            # Load ground truth
-            ground_truth = load_ground_truth(pdb_id, gt_dir)
+    target_stubs = [
+        {name: float(values[i]) for name, values in stub_draws.items()}
+        for i in range(len(targets))
+    ]
 
-            # Generate SAR
-            sar = generate_sar(target, prediction, ground_truth, args)
+    # Targets are independent, so fan them out to worker processes;
+    # map() yields results in manifest order
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        results = executor.map(
+            _process_target, targets,
+            [pred_dir] * len(targets), [gt_dir] * len(targets), target_stubs,
+            chunksize=4
+        )
+
+        for i, (pdb_id, record, error) in enumerate(results, 1):
+            print(f"[{i}/{len(targets)}] {pdb_id}...", end=" ")
+
+            if error is not None:
+                print(f"✗ ERROR: {error}", file=sys.stderr)
+                validation_errors.append({"pdb_id": pdb_id, "error": error})
+
+                if args.strict_mode:
+                    sys.exit(1)
+                continue
+
+            records.append(record)
+            print("✓")
+
+    # Classify all targets in one vectorized pass
+    print(f"\nClassifying {len(records)} targets...")
+    sars = generate_sar_batch(records, run_timestamp)
+
+    # Hoist module attribute lookups out of the per-SAR write loop
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+    _sha256 = hashlib.sha256
+    _validate = validate_sar
+    dump_option = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+    out_prefix = os.fspath(output_dir)
+
+    for sar in sars:
+        pdb_id = sar["pdb_id"]
+        print(f"  {pdb_id}...", end=" ")
 
-            # Validate SAR
-            validate_sar(sar, strict_mode=args.strict_mode)
+        try:
+            # Validate the serialized form: that is what gets written and
+            # hashed into the marker (orjson writes NaN as null, for one)
+            sar_bytes = _dumps(sar, option=dump_option)
+            _validate(_loads(sar_bytes), strict_mode=args.strict_mode)
 
             # Write SAR
-            sar_file = output_dir / f"{pdb_id}.json"
-            with open(sar_file, 'w') as f:
-                json.dump(sar, f, indent=2)
+            sar_file = f"{out_prefix}/{pdb_id}.json"
+            with open(sar_file, 'wb') as f:
+                f.write(sar_bytes)
+            sar_hashes[pdb_id] = _sha256(sar_bytes).hexdigest()
 
             print(f"✓ {sar['decision_gate']}")
             success_count += 1
@@ -445,6 +765,10 @@ def main():
             if args.strict_mode:
                 sys.exit(1)
 
+    # Strict mode exits on the first error, so every SAR written here passed validation
+    if args.strict_mode:
+        write_validation_marker(output_dir, sar_hashes)
+
     print(f"\n{'='*60}")
     print(f"SAR generation complete: {success_count}/{len(targets)} successful")
 
@@ -8,24 +8,151 @@ If AF3 unavailable: generates deterministic stub outputs with STUB_OUTPUT proven
 """
 
 import argparse
-import json
+import base64
 import os
 import sys
-from datetime import datetime
+import zlib
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Any
-import random
+from functools import partial
+from typing import Callable, Dict, Any, Optional
+from multiprocessing import Pool
 import numpy as np
+import orjson
 
 
-def set_deterministic_seed(seed: int):
-    """Set seeds for reproducible execution."""
-    random.seed(seed)
-    np.random.seed(seed)
-    # Note: In production, would also set torch.manual_seed(seed) etc.
+# Version of the stub generator's output; part of the prediction cache key, so
+# bump it whenever run_alphafold3_stub would produce different predictions
+STUB_VERSION = 1
 
+# Columnar layout for the manifest fields the inclusion criteria test
+# (resolution kept float64 so boundary values such as 2.2 compare exactly)
+CRITERIA_DTYPE = np.dtype([
+    ("pdb_id", "O"),
+    ("method", "O"),
+    ("resolution", "f8"),
+    ("release_date", "M8[D]"),
+])
 
-def run_alphafold3_stub(pdb_id: str, seed: int, recycles: int, output_dir: Path) -> Dict[str, Any]:
+
+def _criteria_row(target: Any) -> tuple:
+    """One targets_table row; missing or malformed fields become None/NaN/NaT."""
+    if not isinstance(target, dict):
+        target = {}
+    try:
+        resolution = float(target.get("resolution"))
+    except (TypeError, ValueError):
+        resolution = np.nan
+    try:
+        release_date = np.datetime64(target.get("release_date"), "D")
+    except (TypeError, ValueError):
+        release_date = np.datetime64("NaT", "D")
+    return (target.get("pdb_id"), target.get("method"), resolution, release_date)
+
+
+def targets_table(targets) -> np.ndarray:
+    """Build a structured array of the criteria fields of the manifest targets."""
+    return np.array([_criteria_row(target) for target in targets], dtype=CRITERIA_DTYPE)
+
+
+def criteria_violations(table: np.ndarray, criteria: Dict[str, Any]) -> np.ndarray:
+    """
+    Return the PDB ids in table that fall outside the manifest inclusion criteria.
+
+    Targets missing a tested field (NaN/NaT compare False) are reported too.
+    """
+    included = np.ones(len(table), dtype=bool)
+    if "method" in criteria:
+        included &= table["method"] == criteria["method"]
+    if "resolution_max" in criteria:
+        included &= table["resolution"] <= criteria["resolution_max"]
+    if "release_date_min" in criteria:
+        included &= table["release_date"] >= np.datetime64(criteria["release_date_min"], "D")
+    if "release_date_max" in criteria:
+        included &= table["release_date"] <= np.datetime64(criteria["release_date_max"], "D")
+    return table["pdb_id"][~included]
+
+
+def utc_timestamp() -> str:
+    """Current UTC time as ISO 8601 with a Z suffix (second precision)."""
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def write_file_bytes(path: str, data: bytes) -> None:
+    """Write data to path straight through the file descriptor (no Python I/O layers)."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            # os.write may write less than requested; keep going until done
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def load_cached_prediction(cache_file: str, pdb_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the cached stub prediction for pdb_id, or None on a miss.
+
+    Entries that fail to parse or belong to another target are evicted.
+    """
+    try:
+        with open(cache_file, 'rb') as f:
+            cached = orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, orjson.JSONDecodeError):
+        cached = None
+    if isinstance(cached, dict) and cached.get("pdb_id") == pdb_id:
+        return cached
+    print(f"  Warning: discarding invalid cache entry {cache_file}", file=sys.stderr)
+    try:
+        os.remove(cache_file)
+    except OSError:
+        pass
+    return None
+
+
+def deterministic_rng(seed: int) -> np.random.Generator:
+    """
+    Create a seeded PCG64 generator for reproducible execution.
+
+    Each call owns its generator, so no global RNG state is shared across
+    targets or worker processes.
+    """
+    # Note: In production, would also seed torch (torch.Generator) etc.
+    return np.random.default_rng(seed)
+
+
+def _draw_stub_arrays(rng: np.random.Generator, n_residues: int):
+    """
+    Draw stub coordinates, pLDDT and PAE from the seeded generator in one pass.
+
+    Buffers are filled in place and scaled without temporaries. Draw order is
+    fixed (coords, pLDDT, PAE) so outputs stay reproducible.
+    """
+    coords = np.empty((n_residues, 3))
+    plddt = np.empty(n_residues)
+    pae = np.empty((n_residues, n_residues))
+
+    rng.standard_normal(out=coords)
+    coords *= 10.0
+    # uniform(lo, hi) == lo + (hi - lo) * random(), done in place
+    rng.random(out=plddt)
+    plddt *= 95.0 - 60.0
+    plddt += 60.0
+    # PAE is symmetric: draw the upper triangle (diagonal included) and mirror it
+    iu = np.triu_indices(n_residues)
+    pae_upper = rng.random(iu[0].size)
+    pae_upper *= 15.0 - 2.0
+    pae_upper += 2.0
+    pae[iu] = pae_upper
+    pae.T[iu] = pae_upper
+    return coords, plddt, pae
+
+
+def run_alphafold3_stub(pdb_id: str, seed: int, recycles: int, output_dir: str,
+                        timestamp: Optional[str] = None) -> Dict[str, Any]:
     """
     Deterministic stub for AF3 inference when actual model unavailable.
 
@@ -33,44 +160,59 @@ def run_alphafold3_stub(pdb_id: str, seed: int, recycles: int, output_dir: Path)
     Sets STUB_OUTPUT flag in provenance.
     """
     # Create deterministic "prediction" based on pdb_id hash
-    pdb_hash = sum(ord(c) for c in pdb_id)
-    set_deterministic_seed(seed + pdb_hash)
+    pdb_hash = zlib.crc32(pdb_id.encode())
+    rng = deterministic_rng(seed + pdb_hash)
 
     # Generate stub coordinates (not actual predictions)
     n_residues = 280 + (pdb_hash % 50)  # Typical kinase size ~280-330 residues
-    stub_coords = np.random.randn(n_residues, 3) * 10.0
+    stub_coords, plddt_scores, pae_matrix = _draw_stub_arrays(rng, n_residues)
 
-    # Generate stub confidence metrics
-    plddt_scores = np.random.uniform(60, 95, n_residues)
-    pae_matrix = np.random.uniform(2, 15, (n_residues, n_residues))
+    # Confidence metrics carry no meaning past 2 d.p.; float32 also serializes
+    # to the short repr, shrinking the n x n PAE payload on disk
+    plddt_scores = np.round(plddt_scores, 2).astype(np.float32)
+    pae_matrix = np.round(pae_matrix, 2, out=pae_matrix).astype(np.float32)
 
     result = {
         "pdb_id": pdb_id,
         "n_residues": n_residues,
-        "coordinates": stub_coords.tolist(),
-        "plddt": plddt_scores.tolist(),
-        "pae": pae_matrix.tolist(),
+        # Coordinates travel as a base64 float32 blob (row-major, n_residues x 3)
+        "coordinates_b64": base64.b64encode(stub_coords.astype(np.float32).tobytes()).decode("ascii"),
+        "coordinates_dtype": "float32",
+        "plddt": plddt_scores,
+        "pae": pae_matrix,
         "model_version": "af3_stub",
         "seed": seed,
         "recycles": recycles,
         "stub_output": True,
-        "timestamp": datetime.utcnow().isoformat() + "Z"
+        "timestamp": timestamp or utc_timestamp()
     }
 
     return result
 
 
-def process_target(target: Dict[str, Any], args, output_dir: Path, execution_log: List[Dict]) -> bool:
+def process_target(target: Dict[str, Any], stub_fn: Callable[..., Dict[str, Any]],
+                   output_dir: str, cache_dir: Optional[str] = None) -> Dict[str, Any]:
     """
     Process a single target.
 
-    Returns True on success, False on failure.
+    stub_fn is run_alphafold3_stub with the run's seed, recycles and output_dir
+    already bound (see _init_worker). If cache_dir is given (one directory per
+    stub version and seed/recycles pair), stub predictions are reused from and
+    saved to it.
+
+    Returns the target's execution log entry, with status "success" or "error".
     On failure: logs error and continues batch processing.
     """
     pdb_id = target["pdb_id"]
+    # One timestamp per target, shared by the prediction and its log entry
+    timestamp = utc_timestamp()
 
     try:
         print(f"Processing {pdb_id}...")
+        # Shard by the first two characters of the PDB id to bound directory size
+        shard_dir = f"{output_dir}/{pdb_id[:2]}"
+        os.makedirs(shard_dir, exist_ok=True)
+        output_file = f"{shard_dir}/{pdb_id}_prediction.json"
 
         # Check if AF3 is available (in this scaffold, always use stub)
         af3_available = False  # Set to True when actual AF3 integration exists
@@ -78,44 +220,74 @@ def process_target(target: Dict[str, Any], args, output_dir: Path, execution_log
         if af3_available:
             # Production code would call actual AF3 here
             raise NotImplementedError("AF3 integration not implemented")
+
+        # Stub output is a pure function of (pdb_id, seed, recycles, STUB_VERSION),
+        # so a cached copy from an earlier run can be reused
+        cache_file = f"{cache_dir}/{pdb_id}.json" if cache_dir else None
+        result = load_cached_prediction(cache_file, pdb_id) if cache_file else None
+        if result is not None:
+            # Restamp so the prediction agrees with this run's log entry
+            result["timestamp"] = timestamp
+            write_file_bytes(output_file, orjson.dumps(result, option=orjson.OPT_INDENT_2))
+            del result
         else:
             # Use deterministic stub
-            result = run_alphafold3_stub(
-                pdb_id=pdb_id,
-                seed=args.seed,
-                recycles=args.recycles,
-                output_dir=output_dir
-            )
-
-        # Write output
-        output_file = output_dir / f"{pdb_id}_prediction.json"
-        with open(output_file, 'w') as f:
-            json.dump(result, f, indent=2)
+            result = stub_fn(pdb_id=pdb_id, timestamp=timestamp)
+
+            # Write output; orjson serializes the ndarrays straight from their
+            # buffers instead of boxing every element into a Python float
+            payload = orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+            # Release the coordinate/pLDDT/PAE arrays before writing
+            del result
+            write_file_bytes(output_file, payload)
+            if cache_file:
+                # Write-then-rename so a crash never leaves a truncated entry
+                tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+                write_file_bytes(tmp_file, payload)
+                os.replace(tmp_file, cache_file)
+
+        print(f"  ✓ {pdb_id} completed")
 
         # Log success
-        execution_log.append({
+        return {
             "pdb_id": pdb_id,
             "status": "success",
-            "output_file": str(output_file),
-            "timestamp": datetime.utcnow().isoformat() + "Z"
-        })
-
-        print(f"  ✓ {pdb_id} completed")
-        return True
+            "output_file": output_file,
+            "timestamp": timestamp
+        }
 
     except Exception as e:
         # Log error and continue batch
         error_msg = f"Error processing {pdb_id}: {str(e)}"
         print(f"  ✗ {error_msg}", file=sys.stderr)
 
-        execution_log.append({
+        return {
             "pdb_id": pdb_id,
             "status": "error",
             "error": str(e),
-            "timestamp": datetime.utcnow().isoformat() + "Z"
-        })
+            "timestamp": timestamp
+        }
+
+
+# Per-worker state, set once by _init_worker so only the target is pickled per task
+_worker_stub = None
+_worker_output_dir = None
+_worker_cache_dir = None
 
-        return False
+
+def _init_worker(args, output_dir: str, cache_dir: Optional[str]) -> None:
+    """Pool initializer: bind the run configuration in each worker process."""
+    global _worker_stub, _worker_output_dir, _worker_cache_dir
+    # seed/recycles are fixed for the whole run, so bind them once here
+    _worker_stub = partial(run_alphafold3_stub, seed=args.seed, recycles=args.recycles,
+                           output_dir=output_dir)
+    _worker_output_dir = output_dir
+    _worker_cache_dir = cache_dir
+
+
+def _process_target_worker(target: Dict[str, Any]) -> Dict[str, Any]:
+    """Pool task: process one target with the worker's bound configuration."""
+    return process_target(target, _worker_stub, _worker_output_dir, _worker_cache_dir)
 
 
 def main():
@@ -150,6 +322,17 @@ def main():
         required=True,
         help="Output directory for predictions"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for per-target inference (default: CPU count)"
+    )
+    parser.add_argument(
+        "--no_cache",
+        action="store_true",
+        help="Regenerate stub predictions instead of reusing output_dir/.cache"
+    )
 
     args = parser.parse_args()
 
@@ -161,27 +344,52 @@ def main():
 
     # Load manifest
     print(f"Loading manifest: {args.manifest}")
-    with open(args.manifest, 'r') as f:
-        manifest = json.load(f)
+    manifest = orjson.loads(Path(args.manifest).read_bytes())
 
     targets = manifest["targets"]
     print(f"Found {len(targets)} targets in manifest")
 
+    # Sanity-check targets against the manifest's inclusion criteria
+    violations = criteria_violations(targets_table(targets), manifest.get("inclusion_criteria", {}))
+    if violations.size:
+        print(f"WARNING: targets outside inclusion criteria: {', '.join(map(str, violations.tolist()))}",
+              file=sys.stderr)
+
     # Create output directory
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Initialize execution log
-    execution_log = []
+    # Stub predictions are cached per stub version and seed/recycles pair
+    cache_dir = None
+    if not args.no_cache:
+        cache_dir = (output_dir / ".cache" /
+                     f"stub{STUB_VERSION}_seed{args.seed}_recycles{args.recycles}")
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_dir = os.fspath(cache_dir)
+
+    # Execution log is streamed to JSONL as targets finish rather than held
+    # in memory; the buffered file coalesces the per-target lines into few writes
+    execution_log_file = output_dir / "execution_log.jsonl"
 
     # Process targets in manifest order (CRITICAL: maintain serialized order)
     print(f"\nProcessing targets in manifest order...")
     success_count = 0
-
-    for i, target in enumerate(targets, 1):
-        print(f"\n[{i}/{len(targets)}]", end=" ")
-        if process_target(target, args, output_dir, execution_log):
-            success_count += 1
+    # Failed entries are also kept inline in the provenance (per-target failures
+    # must be logged in execution_provenance.json); successes stay JSONL-only
+    error_log = []
+
+    # Targets are independent, so they run across worker processes; imap (not
+    # imap_unordered) yields results in manifest order for the execution log
+    with open(execution_log_file, 'wb') as log_f, \
+            Pool(processes=args.workers, initializer=_init_worker,
+                 initargs=(args, os.fspath(output_dir), cache_dir)) as pool:
+        for i, log_entry in enumerate(pool.imap(_process_target_worker, targets, chunksize=1), 1):
+            print(f"[{i}/{len(targets)}] {log_entry['pdb_id']}: {log_entry['status']}")
+            log_f.write(orjson.dumps(log_entry, option=orjson.OPT_APPEND_NEWLINE))
+            if log_entry["status"] == "success":
+                success_count += 1
+            else:
+                error_log.append(log_entry)
 
     # Write execution provenance
     provenance = {
@@ -191,16 +399,17 @@ def main():
         "seed": args.seed,
         "recycles": args.recycles,
         "output_dir": args.output_dir,
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "stub_cache": cache_dir,
+        "timestamp": utc_timestamp(),
         "targets_total": len(targets),
         "targets_success": success_count,
         "targets_failed": len(targets) - success_count,
-        "execution_log": execution_log
+        "errors": error_log,
+        "execution_log": str(execution_log_file)
     }
 
     provenance_file = output_dir / "execution_provenance.json"
-    with open(provenance_file, 'w') as f:
-        json.dump(provenance, f, indent=2)
+    provenance_file.write_bytes(orjson.dumps(provenance, option=orjson.OPT_INDENT_2))
 
     print(f"\n{'='*60}")
     print(f"Inference complete: {success_count}/{len(targets)} successful")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Convert ground truth structures to the binary layout used by generate_sar.py.
+
+Rewrites each <pdb_id>_ground_truth.json as:
+- <pdb_id>.coords.npy  (float32 coordinates, memory-mapped at load time)
+- <pdb_id>.meta.json   (all remaining fields)
+
+generate_sar.py prefers the binary layout when both are present, so the
+JSON originals can be kept for audit.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+
+def convert_gt_to_npy(gt_dir: Path, remove_json: bool = False) -> List[str]:
+    """
+    Convert every *_ground_truth.json in gt_dir to .coords.npy + .meta.json.
+
+    Returns the list of converted pdb_ids.
+    """
+    converted = []
+
+    for gt_file in sorted(gt_dir.glob("*_ground_truth.json")):
+        with open(gt_file, 'r') as f:
+            ground_truth = json.load(f)
+
+        pdb_id = ground_truth.get("pdb_id") or gt_file.name[:-len("_ground_truth.json")]
+        coords = np.asarray(ground_truth.pop("coordinates"), dtype=np.float32)
+
+        np.save(gt_dir / f"{pdb_id}.coords.npy", coords)
+        with open(gt_dir / f"{pdb_id}.meta.json", 'w') as f:
+            json.dump(ground_truth, f, indent=2)
+
+        if remove_json:
+            gt_file.unlink()
+
+        converted.append(pdb_id)
+
+    return converted
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Convert ground truth JSON files to memory-mappable .npy coordinates"
+    )
+    parser.add_argument(
+        "--ground_truth_dir",
+        default="pdb_ground_truth",
+        help="Directory containing <pdb_id>_ground_truth.json files"
+    )
+    parser.add_argument(
+        "--remove_json",
+        action="store_true",
+        help="Delete each JSON original after conversion"
+    )
+
+    args = parser.parse_args()
+
+    gt_dir = Path(args.ground_truth_dir)
+    if not gt_dir.is_dir():
+        print(f"ERROR: Not a directory: {gt_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    converted = convert_gt_to_npy(gt_dir, remove_json=args.remove_json)
+
+    for pdb_id in converted:
+        print(f"Converted {pdb_id}")
+    print(f"Converted {len(converted)} ground truth files in {gt_dir}")
+
+
+if __name__ == "__main__":
+    main()